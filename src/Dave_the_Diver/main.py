@@ -73,8 +73,8 @@ data = [
     ["Godzilla vs. Ebirah Curry", 370, 1369, 140, 365, 6, 9, "2 European Lobster, 2 Moray Eel, 1 Turmeric, 1 Olive Oil", "Complete Go to Bancho Sushi", None],
 ]
 
-Farm_Ingredients = ["Wheat", "Carrot", "Onion", "Cherry Toamto", "Bean", "Eggplant", "Garlic", "Rice", "Habanero", "Cucumber", "Egg", "Agar", "Kajime", "Seaweed", "Kelp", "Sea Grape", "Black Coral", "Southern Bull Kelp", "Buckbean", "Bladderwrack", "Hyalonema"]
-Spices = ["Soy Sauce", "Black Vinegar", "Olive Oil", "Black Pepper", "Mayonnaise", "Curry Block", "Tumeric", "Salt", "Miso", "Sesame Seed", "Truffle"]
+Farm_Ingredients = ["Wheat", "Carrot", "Onion", "Cherry Tomato", "Bean", "Eggplant", "Garlic", "Rice", "Habanero", "Cucumber", "Egg", "Agar", "Kajime", "Seaweed", "Kelp", "Sea Grape", "Black Coral", "Southern Bull Kelp", "Buckbean", "Bladderwrack", "Hyalonema"]
+Spices = ["Soy Sauce", "Black Vinegar", "Olive Oil", "Black Pepper", "Mayonnaise", "Curry Block", "Turmeric", "Salt", "Miso", "Sesame Seed", "Truffle"]
 
 df = pd.DataFrame(data, columns=[
     'Name', 'BasePrice', 'MaxPrice', 'BaseTaste', 'MaxTaste',
@@ -94,10 +94,11 @@ def calculate_efficiency_score(row):
             farm_ingredients_count+=0.05*num
     return max_price_serving / farm_ingredients_count
 
-df['EfficiencyScore'] = df.apply(calculate_efficiency_score, axis=1)
+if __name__ == "__main__":
+    df['EfficiencyScore'] = df.apply(calculate_efficiency_score, axis=1)
 
-df = df.sort_values(by='EfficiencyScore', ascending=False)
+    df = df.sort_values(by='EfficiencyScore', ascending=False)
 
-df[['Name', 'Ingredients', 'MaxPrice', 'MaxServing', 'EfficiencyScore']].to_csv('recipes_efficiency_scores.txt', index=False, sep='\t')
+    df[['Name', 'Ingredients', 'MaxPrice', 'MaxServing', 'EfficiencyScore']].to_csv('recipes_efficiency_scores.txt', index=False, sep='\t')
 
-print("Efficiency scores exported to 'recipes_efficiency_scores.txt'")
+    print("Efficiency scores exported to 'recipes_efficiency_scores.txt'")
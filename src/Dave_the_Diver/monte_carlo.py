@@ -0,0 +1,147 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from main import df, Farm_Ingredients, Spices
+
+# Chance an ingredient of each kind is on hand on a given night
+FARM_AVAILABILITY = 0.95
+SPICE_AVAILABILITY = 1.0
+CATCH_AVAILABILITY = 0.8
+
+
+def ingredient_names(ingredients):
+    return [ingredient.partition(' ')[2] for ingredient in ingredients.split(', ')]
+
+
+def ingredient_availability(name):
+    if name in Farm_Ingredients:
+        return FARM_AVAILABILITY
+    if name in Spices:
+        return SPICE_AVAILABILITY
+    return CATCH_AVAILABILITY
+
+
+dish_index = {name: i for i, name in enumerate(df['Name'])}
+prices = df['MaxPrice'].to_numpy(dtype=float)
+min_servings = df['BaseServing'].to_numpy(dtype=np.int64)
+max_servings = df['MaxServing'].to_numpy(dtype=np.int64)
+tastes = df['MaxTaste'].to_numpy(dtype=float)
+
+# uses[d, j] is True when dish d needs ingredient j
+dish_ingredients = df['Ingredients'].map(ingredient_names)
+ingredient_list = sorted({name for names in dish_ingredients for name in names})
+ingredient_index = {name: j for j, name in enumerate(ingredient_list)}
+ingredient_p = np.array([ingredient_availability(name) for name in ingredient_list])
+uses = np.zeros((len(df), len(ingredient_list)), dtype=bool)
+for d, names in enumerate(dish_ingredients):
+    uses[d, [ingredient_index[name] for name in names]] = True
+
+
+def simulate_menu(menu, nights=10000, customers=40, batches=1, price_sd=0.1, taste_sd=0.2,
+                  taste_weight=1.0, rng=None):
+    """Simulate many nights of one menu at once and summarize its revenue.
+
+    Each night every ingredient the menu needs comes in for a binomial number of
+    batches, and a dish can be prepared as many batches as its scarcest
+    ingredient allows, so dishes sharing an ingredient run short together.
+    Shared ingredients are not split between dishes. Each batch yields a uniform
+    number of portions between BaseServing and MaxServing. Customers arrive as a
+    Poisson stream and pick dishes by taste, perturbed each night by log-normal
+    noise of scale taste_sd. Each plate sells for MaxPrice times a noisy tip/combo
+    multiplier. Raises ValueError for a dish that is not in the table.
+    """
+    unknown = [name for name in menu if name not in dish_index]
+    if unknown:
+        raise ValueError(f"Unknown dish: {', '.join(unknown)}")
+    rng = np.random.default_rng(rng)
+    idx = np.array([dish_index[name] for name in menu])
+    needed = np.nonzero(uses[idx].any(axis=0))[0]
+    columns = [np.nonzero(uses[d, needed])[0] for d in idx]
+
+    # Poisson arrivals split by taste give independent Poisson orders per dish
+    weights = tastes[idx] ** taste_weight * rng.lognormal(0.0, taste_sd, size=(nights, len(idx)))
+    weights /= weights.sum(axis=1, keepdims=True)
+    orders = rng.poisson(customers * weights)
+
+    # Count batches per ingredient as Bernoulli draws; much cheaper than rng.binomial for few batches
+    on_hand = (rng.random((nights, len(needed), batches)) < ingredient_p[needed, None]).sum(axis=2)
+    dish_batches = np.column_stack([on_hand[:, cols].min(axis=1) for cols in columns])
+    portions = rng.integers(min_servings[idx, None], max_servings[idx, None] + 1,
+                            size=(nights, len(idx), batches))
+    stock = (portions * (np.arange(batches) < dish_batches[..., None])).sum(axis=2)
+    sold = np.minimum(orders, stock)
+
+    multiplier = np.clip(rng.normal(1.0, price_sd, size=(nights, len(idx))), 0, None)
+    revenue = (sold * prices[idx] * multiplier).sum(axis=1)
+
+    mean = revenue.mean()
+    half_width = 1.96 * revenue.std(ddof=1) / np.sqrt(nights)
+    return {
+        'Menu': tuple(menu),
+        'MeanRevenue': mean,
+        'CILow': mean - half_width,
+        'CIHigh': mean + half_width,
+        'StdRevenue': revenue.std(ddof=1),
+        'P5Revenue': np.percentile(revenue, 5),
+        # Demand used up a stocked dish, kept apart from nights it could not be made
+        'SellOutRate': ((orders > stock) | ((orders == stock) & (stock > 0))).mean(axis=0).tolist(),
+        'UnavailableRate': (stock == 0).mean(axis=0).tolist(),
+    }
+
+
+def _simulate_chunk(menus, seeds, kwargs):
+    return [simulate_menu(menu, rng=seed, **kwargs) for menu, seed in zip(menus, seeds)]
+
+
+def evaluate_menus(menus, nights=2000, workers=None, seed=None, **kwargs):
+    """Score candidate menus by simulated nightly revenue, best first"""
+    menus = [tuple(menu) for menu in menus]
+    seeds = np.random.SeedSequence(seed).spawn(len(menus))
+    kwargs['nights'] = nights
+
+    if workers:
+        chunk = max(1, len(menus) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_simulate_chunk, menus[i:i + chunk], seeds[i:i + chunk], kwargs)
+                       for i in range(0, len(menus), chunk)]
+            results = [result for future in futures for result in future.result()]
+    else:
+        results = _simulate_chunk(menus, seeds, kwargs)
+
+    return pd.DataFrame(results).sort_values(by='MeanRevenue', ascending=False, ignore_index=True)
+
+
+def random_menus(size, count, seed=None):
+    rng = np.random.default_rng(seed)
+    names = df['Name'].to_numpy()
+    return [tuple(rng.choice(names, size=size, replace=False)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo nightly revenue for Dave the Diver menus")
+    parser.add_argument('--menu', action='append', help="Dish on the menu (repeat); random menus if omitted")
+    parser.add_argument('--size', type=int, default=5, help="Dishes per random menu")
+    parser.add_argument('--candidates', type=int, default=1000, help="Number of random menus")
+    parser.add_argument('--nights', type=int, default=2000)
+    parser.add_argument('--customers', type=float, default=40)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    menus = [args.menu] if args.menu else random_menus(args.size, args.candidates, args.seed)
+    try:
+        scores = evaluate_menus(menus, nights=args.nights, workers=args.workers, seed=args.seed,
+                                customers=args.customers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for _, row in scores.head(args.top).iterrows():
+        print(f"{row['MeanRevenue']:.0f} (95% CI {row['CILow']:.0f}-{row['CIHigh']:.0f}): {', '.join(row['Menu'])}")
+
+
+if __name__ == "__main__":
+    main()
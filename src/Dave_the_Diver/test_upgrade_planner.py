@@ -0,0 +1,45 @@
+import itertools
+
+import pytest
+
+from main import df
+from upgrade_planner import MAX_LEVEL, level_table, plan_upgrades
+
+MENU = ['Tomato Egg Soup', 'Dried Stingray', 'Hyalonema Tuna Sashimi']
+LEVELS = {'Dried Stingray': 4}
+
+
+def brute_force(budget):
+    rows = [df[df['Name'] == name].iloc[0] for name in MENU]
+    starts = [LEVELS.get(row['Name'], 1) for row in rows]
+    best = 0
+    for targets in itertools.product(*[range(start, MAX_LEVEL + 1) for start in starts]):
+        cost = sum((end - start) * int(row['ArtisanFlameCost'])
+                   for row, start, end in zip(rows, starts, targets))
+        if cost <= budget:
+            gain = sum(level_table(row)[end - 1] - level_table(row)[start - 1]
+                       for row, start, end in zip(rows, starts, targets))
+            best = max(best, gain)
+    return best
+
+
+@pytest.mark.parametrize('budget', [0, 7, 20, 33, 60])
+def test_matches_brute_force(budget):
+    total_gain, spent, upgrades = plan_upgrades(budget, LEVELS, MENU)
+
+    assert total_gain == brute_force(budget)
+    assert spent <= budget
+    assert spent == sum(flames for _, _, _, flames, _ in upgrades)
+    assert total_gain == sum(gain for _, _, _, _, gain in upgrades)
+
+
+@pytest.mark.parametrize('budget, levels, menu', [
+    (-1, None, None),
+    (10, {'No Such Dish': 2}, None),
+    (10, None, ['No Such Dish']),
+    (10, {'Tomato Egg Soup': 0}, None),
+    (10, {'Tomato Egg Soup': MAX_LEVEL + 1}, None),
+])
+def test_rejects_bad_input(budget, levels, menu):
+    with pytest.raises(ValueError):
+        plan_upgrades(budget, levels, menu)
@@ -0,0 +1,107 @@
+import argparse
+
+import numpy as np
+
+from main import df
+
+MAX_LEVEL = 10
+
+
+def level_table(row):
+    # Price and servings grow linearly from level 1 (base) to MAX_LEVEL (max)
+    levels = np.arange(1, MAX_LEVEL + 1)
+    t = (levels - 1) / (MAX_LEVEL - 1)
+    price = np.rint(row['BasePrice'] + (row['MaxPrice'] - row['BasePrice']) * t)
+    serving = np.rint(row['BaseServing'] + (row['MaxServing'] - row['BaseServing']) * t)
+    return price * serving
+
+
+def plan_upgrades(budget, current_levels=None, menu=None):
+    """Spend up to budget Artisan's Flames to maximize the gain in nightly revenue.
+
+    ArtisanFlameCost is the flame cost of each level-up. Dishes without a flame
+    cost are not upgraded with flames and are left out. Raises ValueError for a
+    negative budget, an unknown dish or a level outside 1..MAX_LEVEL. Returns the
+    total gain, the flames spent and a list of (name, from_level, to_level,
+    flames, gain).
+    """
+    current_levels = current_levels or {}
+    if budget < 0:
+        raise ValueError(f"Budget must not be negative, got {budget}")
+    known = set(df['Name'])
+    for name, level in current_levels.items():
+        if name not in known:
+            raise ValueError(f"Unknown dish: {name}")
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"Level of {name} must be between 1 and {MAX_LEVEL}, got {level}")
+    unknown = [name for name in menu or [] if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown dish: {', '.join(unknown)}")
+
+    rows = df[df['ArtisanFlameCost'].notna()]
+    if menu is not None:
+        rows = rows[rows['Name'].isin(menu)]
+
+    budget = int(budget)
+    dishes = []
+    for _, row in rows.iterrows():
+        level = int(current_levels.get(row['Name'], 1))
+        if level >= MAX_LEVEL:
+            continue
+        revenue = level_table(row)
+        steps = np.arange(0, MAX_LEVEL - level + 1)
+        cost = steps * int(row['ArtisanFlameCost'])
+        gain = revenue[level - 1 + steps] - revenue[level - 1]
+        keep = cost <= budget
+        dishes.append((row['Name'], level, cost[keep], gain[keep]))
+
+    # Grouped knapsack: best[b] is the top gain using at most b flames
+    best = np.zeros(budget + 1)
+    choices = np.zeros((len(dishes), budget + 1), dtype=np.int8)
+    for i, (_, _, cost, gain) in enumerate(dishes):
+        candidates = np.full((len(cost), budget + 1), -np.inf)
+        for k in range(len(cost)):
+            candidates[k, cost[k]:] = best[:budget + 1 - cost[k]] + gain[k]
+        choices[i] = candidates.argmax(axis=0)
+        best = candidates.max(axis=0)
+
+    upgrades = []
+    remaining = budget
+    for i in range(len(dishes) - 1, -1, -1):
+        name, level, cost, gain = dishes[i]
+        k = choices[i, remaining]
+        if k > 0:
+            upgrades.append((name, level, level + int(k), int(cost[k]), float(gain[k])))
+            remaining -= int(cost[k])
+
+    upgrades.sort(key=lambda u: u[4], reverse=True)
+    return float(best[budget]), budget - remaining, upgrades
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan Artisan's Flame upgrades for the most nightly revenue")
+    parser.add_argument('budget', type=int, help="Artisan's Flames available")
+    parser.add_argument('--level', action='append', default=[],
+                        help="Current level of a dish, e.g. \"Tomato Egg Soup=3\" (default 1)")
+    parser.add_argument('--menu', action='append', help="Only consider these dishes")
+    args = parser.parse_args()
+
+    current_levels = {}
+    for spec in args.level:
+        name, _, level = spec.rpartition('=')
+        if not level.isdigit():
+            parser.error(f"--level expects \"Name=level\", got {spec!r}")
+        current_levels[name] = int(level)
+
+    try:
+        total_gain, spent, upgrades = plan_upgrades(args.budget, current_levels, args.menu)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for name, start, end, flames, gain in upgrades:
+        print(f"{name}: level {start} -> {end} ({flames} flames, +{gain:.0f}/night)")
+    print(f"Total: +{total_gain:.0f}/night for {spent} of {args.budget} flames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import argparse
+import csv
+import json
+import math
+import os
+
+
+CSV_COLUMNS = ['record', 'id', 'parent_id', 'item', 'name', 'recipe', 'rate',
+               'buildings', 'buildings_needed', 'power', 'depth', 'detail']
+
+FORMATS = {'.jsonl': 'jsonl', '.csv': 'csv', '.dot': 'dot', '.gv': 'dot'}
+
+
+def iter_tree(tree):
+    """Yield (node_id, parent_id, node) for the production tree in depth-first order"""
+    if tree is None:
+        return
+    stack = [(tree, None)]
+    next_id = 0
+    while stack:
+        node, parent_id = stack.pop()
+        node_id = next_id
+        next_id += 1
+        yield node_id, parent_id, node
+        # Reverse so children come out in recipe order
+        for child in reversed(node.get('children', [])):
+            stack.append((child, node_id))
+
+
+def iter_records(chain, optimizer):
+    """Yield flat records describing every part of a production chain"""
+    names = optimizer.all_items
+    power_by_building = {b.get('name', category): b.get('power', 0) for category, b in optimizer.buildings.items()}
+
+    yield {
+        'record': 'summary',
+        'item': chain['target'],
+        'name': names.get(chain['target'], chain['target']),
+        'rate': chain['target_rate'],
+        'buildings': sum(chain['buildings_needed'].values()),
+        'buildings_needed': sum(math.ceil(count) for count in chain['buildings_needed'].values()),
+        'power': chain['power_consumption'],
+    }
+
+    for node_id, parent_id, node in iter_tree(chain['production_tree']):
+        if node.get('is_cycle'):
+            kind = 'cycle'
+        elif node.get('is_raw'):
+            kind = 'raw'
+        else:
+            kind = 'recipe'
+        yield {
+            'record': 'node',
+            'id': node_id,
+            'parent_id': parent_id,
+            'item': node['item'],
+            'name': node['display_name'],
+            'recipe': node.get('recipe'),
+            'rate': node['rate'],
+            'buildings': node['buildings'],
+            'depth': node['depth'],
+            'detail': kind,
+        }
+        if parent_id is not None:
+            yield {
+                'record': 'edge',
+                'id': node_id,
+                'parent_id': parent_id,
+                'item': node['item'],
+                'name': node['display_name'],
+                'rate': node['rate'],
+            }
+
+    for info in chain['recipes_used'].values():
+        yield {
+            'record': 'recipe',
+            'recipe': info['recipe'],
+            'buildings': info['buildings'],
+            'buildings_needed': math.ceil(info['buildings']),
+            'depth': info['depth'],
+            'detail': json.dumps({'inputs_per_min': info['inputs_per_min'],
+                                  'outputs_per_min': info['outputs_per_min']}),
+        }
+
+    for building, count in sorted(chain['buildings_needed'].items()):
+        yield {
+            'record': 'building',
+            'name': building,
+            'buildings': count,
+            'buildings_needed': math.ceil(count),
+            'power': power_by_building.get(building, 0) * count,
+        }
+
+    for material, rate in sorted(chain['raw_materials'].items()):
+        yield {'record': 'raw_material', 'item': material, 'name': names.get(material, material), 'rate': rate}
+
+    for material, info in chain.get('resource_nodes_needed', {}).items():
+        yield {
+            'record': 'resource_node',
+            'item': material,
+            'name': names.get(material, material),
+            'rate': info['required_rate'],
+            'detail': json.dumps({k: v for k, v in info.items() if k != 'required_rate'}),
+        }
+
+    for warning in chain['warnings']:
+        yield {'record': 'warning', 'detail': warning}
+
+
+def write_jsonl(records, f):
+    """Write one JSON object per line"""
+    for record in records:
+        f.write(json.dumps(record))
+        f.write('\n')
+
+
+def write_csv(records, f):
+    """Write records as rows under a shared header"""
+    writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+
+
+def write_dot(chain, optimizer, f):
+    """Write the production tree as a Graphviz digraph with flows on the edges"""
+    f.write(f'digraph "{chain["target"]}" {{\n')
+    f.write('  rankdir=BT;\n  node [shape=box, fontname="Helvetica"];\n')
+    f.write(f'  label="{chain["target_rate"]:.2f}/min, {chain["power_consumption"]:.1f} MW";\n')
+    for node_id, parent_id, node in iter_tree(chain['production_tree']):
+        label = f"{node['display_name']}\\n{node['rate']:.2f}/min"
+        if node.get('is_cycle'):
+            style = ', style=dashed, color=red'
+        elif node.get('is_raw'):
+            style = ', style=filled, fillcolor=lightgrey'
+        else:
+            label += f"\\n{node['recipe']} x{node['buildings']:.2f}"
+            style = ''
+        label = label.replace('"', '\\"')
+        f.write(f'  n{node_id} [label="{label}"{style}];\n')
+        if parent_id is not None:
+            f.write(f'  n{node_id} -> n{parent_id} [label="{node["rate"]:.2f}/min"];\n')
+    for i, warning in enumerate(chain['warnings']):
+        warning = warning.replace('"', '\\"')
+        f.write(f'  warning{i} [shape=note, color=orange, label="{warning}"];\n')
+    f.write('}\n')
+
+
+def export_chain(chain, optimizer, path, fmt=None):
+    """Stream a production chain to path as JSON Lines, CSV or DOT"""
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in ('jsonl', 'csv', 'dot'):
+        raise ValueError(f"Unknown export format for {path}")
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if fmt == 'jsonl':
+            write_jsonl(iter_records(chain, optimizer), f)
+        elif fmt == 'csv':
+            write_csv(iter_records(chain, optimizer), f)
+        else:
+            write_dot(chain, optimizer, f)
+    return path
+
+
+def main():
+    from main import SatisfactoryOptimizer, ResourceNode
+
+    parser = argparse.ArgumentParser(description="Export a Satisfactory production chain")
+    parser.add_argument('item', help="Target item key, e.g. computer")
+    parser.add_argument('output', help="Output path ending in .jsonl, .csv, .dot or .gv")
+    parser.add_argument('--format', choices=['jsonl', 'csv', 'dot'])
+    parser.add_argument('--data', default='data.json')
+    parser.add_argument('--resource', action='append', default=[],
+                        help="Resource node as type:purity:mk, e.g. iron-ore:pure:2")
+    args = parser.parse_args()
+    if args.format is None and os.path.splitext(args.output)[1].lower() not in FORMATS:
+        parser.error(f"can't tell the format of {args.output}; use a known extension or --format")
+
+    # Checked here so a bad path never reaches the optimizer's Tk error dialog
+    if not os.path.exists(args.data):
+        parser.error(f"Data file '{args.data}' not found")
+    nodes = []
+    for spec in args.resource:
+        parts = spec.split(':')
+        if len(parts) != 3 or not parts[2].isdigit():
+            parser.error(f"--resource expects type:purity:mk, got {spec!r}")
+        resource_type, purity, miner_mk = parts
+        nodes.append(ResourceNode(resource_type, purity, int(miner_mk)))
+
+    optimizer = SatisfactoryOptimizer(args.data)
+
+    chain = optimizer.calculate_production_chain(args.item, available_resources=nodes)
+    print(f"Exported to {export_chain(chain, optimizer, args.output, args.format)}")
+
+
+if __name__ == "__main__":
+    main()
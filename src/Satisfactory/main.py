@@ -1,11 +1,12 @@
 import json
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-import pandas as pd
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 from dataclasses import dataclass
 from collections import defaultdict
 import math
 
+from exporter import export_chain
+
 
 @dataclass
 class ResourceNode:
@@ -434,6 +435,8 @@ class SatisfactoryGUI:
         # Calculate button
         ttk.Button(target_frame, text="Calculate Production Chain",
                    command=self.calculate_chain).pack(side='left', padx=20)
+        ttk.Button(target_frame, text="Export Results",
+                   command=self.export_results).pack(side='left', padx=5)
 
         # Results Frame
         results_frame = ttk.LabelFrame(main_frame, text="Production Chain Results", padding="10")
@@ -614,27 +617,24 @@ class SatisfactoryGUI:
                 self.results_text.insert(tk.END, f"  • {warning}\n")
 
     def export_results(self):
-        """Export results to CSV file"""
+        """Export the full plan as JSON Lines, CSV or Graphviz DOT"""
         if not hasattr(self, 'current_chain'):
             messagebox.showwarning("Warning", "No results to export. Please calculate first.")
             return
 
-        # Create DataFrame
-        data = []
-        for recipe_key, info in self.current_chain['recipes_used'].items():
-            data.append({
-                'Recipe': info['recipe'],
-                'Buildings_Exact': f"{info['buildings']:.2f}",
-                'Buildings_Needed': math.ceil(info['buildings']),
-                'Inputs/min': ', '.join([f"{v:.2f} {k}" for k, v in info['inputs_per_min'].items()]),
-                'Outputs/min': ', '.join([f"{v:.2f} {k}" for k, v in info['outputs_per_min'].items()])
-            })
-
-        df = pd.DataFrame(data)
-
-        # Save to CSV
-        filename = f"satisfactory_chain_{self.current_chain['target']}.csv"
-        df.to_csv(filename, index=False)
+        filename = filedialog.asksaveasfilename(
+            initialfile=f"satisfactory_chain_{self.current_chain['target']}.jsonl",
+            defaultextension='.jsonl',
+            filetypes=[('JSON Lines', '*.jsonl'), ('CSV', '*.csv'), ('Graphviz DOT', '*.dot *.gv')]
+        )
+        if not filename:
+            return
+
+        try:
+            export_chain(self.current_chain, self.optimizer, filename)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Export failed: {e}")
+            return
         messagebox.showinfo("Success", f"Results exported to {filename}")
 
 
@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from main import SatisfactoryOptimizer, ResourceNode
+
+
+_worker_optimizer = None
+
+
+def _init_worker(data_path):
+    """Parse game data once per worker process"""
+    global _worker_optimizer
+    _worker_optimizer = SatisfactoryOptimizer(data_path)
+
+
+def _ready():
+    return _worker_optimizer is not None
+
+
+def _solve(target_item, resources):
+    """Run one production chain calculation inside a worker"""
+    nodes = [ResourceNode(resource_type, purity, miner_mk) for resource_type, purity, miner_mk in resources]
+    return _worker_optimizer.calculate_production_chain(target_item, available_resources=nodes or None)
+
+
+class PlanningServer:
+    def __init__(self, data_path='data.json', host='127.0.0.1', port=8765, workers=None):
+        """Local HTTP/JSON service around SatisfactoryOptimizer"""
+        # Checked here so a bad path never reaches the optimizer's Tk error dialog
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Data file '{data_path}' not found")
+        self.data_path = data_path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.optimizer = SatisfactoryOptimizer(data_path)
+        self.executor = None
+        self.server = None
+        self.in_flight = {}
+        self.stats = {'requests': 0, 'solves': 0, 'coalesced': 0}
+
+    async def start(self):
+        """Start the worker pool and begin listening"""
+        # Spawned workers do not inherit open client sockets the way forked ones would
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.data_path,),
+                                            mp_context=multiprocessing.get_context('spawn'))
+        # Bring every worker up front so the first queries don't wait on data.json parsing
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, _ready)
+                               for _ in range(self.workers or os.cpu_count() or 1)])
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and shut the worker pool down"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def solve(self, target_item, resources=()):
+        """Solve a chain, sharing one computation between identical concurrent queries"""
+        key = (target_item, tuple(sorted(resources)))
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, _solve, target_item, key[1])
+        self.in_flight[key] = future
+        self.stats['solves'] += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def _parse_query(self, method, query, body):
+        """Extract target item and resource nodes from a /chain request"""
+        if method == 'POST':
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+        else:
+            payload = {k: v[0] for k, v in parse_qs(query).items()}
+            if 'resources' in payload:
+                raise ValueError("'resources' is only accepted in a POST body")
+
+        target_item = payload.get('item')
+        if not target_item:
+            raise ValueError("Missing 'item'")
+        if not isinstance(target_item, str):
+            raise ValueError("'item' must be a string")
+        if target_item not in self.optimizer.recipes:
+            # Accept display names as well as key names
+            for key, name in self.optimizer.all_items.items():
+                if name == target_item:
+                    target_item = key
+                    break
+
+        resources = []
+        for res in payload.get('resources', []):
+            resource_type, purity = res['resource_type'], res.get('purity', 'normal')
+            # Strings keep the coalescing key hashable and sortable
+            if not isinstance(resource_type, str) or not isinstance(purity, str):
+                raise ValueError("'resource_type' and 'purity' must be strings")
+            resources.append((resource_type, purity, int(res.get('miner_mk', 1))))
+        return target_item, resources
+
+    async def _route(self, method, target, body):
+        """Dispatch a request and return (status, payload)"""
+        url = urlsplit(target)
+        if url.path == '/health' and method == 'GET':
+            return HTTPStatus.OK, {'status': 'ok', **self.stats}
+        if url.path == '/items' and method == 'GET':
+            items = {key: self.optimizer.all_items.get(key, key) for key in sorted(self.optimizer.recipes)}
+            return HTTPStatus.OK, items
+        if url.path == '/chain' and method in ('GET', 'POST'):
+            try:
+                target_item, resources = self._parse_query(method, url.query, body)
+            except (ValueError, KeyError, TypeError) as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            chain = await self.solve(target_item, resources)
+            return HTTPStatus.OK, chain
+        return HTTPStatus.NOT_FOUND, {'error': f"No route for {method} {url.path}"}
+
+    async def _handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                self.stats['requests'] += 1
+                try:
+                    status, payload = await self._route(method, target, body)
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+
+                data = json.dumps(payload).encode()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Satisfactory planning service")
+    parser.add_argument('--data', default='data.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        server = PlanningServer(args.data, args.host, args.port, args.workers)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+import math
+from dataclasses import dataclass
+from collections import defaultdict
+
+import numpy as np
+
+
+DEFAULT_ITEM_STACK = 100
+DEFAULT_FLUID_BUFFER = 50
+
+
+@dataclass
+class SimulationResult:
+    """Time series recorded by a factory simulation run"""
+    times: np.ndarray
+    target_output: np.ndarray
+    target_rate: float
+    node_names: list
+    crafting: np.ndarray
+    starved: np.ndarray
+    blocked: np.ndarray
+    sunk: dict
+    slowest_cycle: float = 0.0
+
+    def default_window(self):
+        """Averaging window long enough to smooth over several of the slowest cycles"""
+        return max(60.0, 4 * self.slowest_cycle)
+
+    def output_rate(self, window=None):
+        """Target output in items per minute over a trailing window of seconds"""
+        if window is None:
+            window = self.default_window()
+        if len(self.times) < 2:
+            return np.zeros_like(self.times)
+        step = self.times[1] - self.times[0]
+        lag = max(1, int(round(window / step)))
+        shifted = np.pad(self.target_output, (lag, 0))[:len(self.times)]
+        span = np.minimum(self.times, lag * step)
+        span[span == 0] = step
+        return (self.target_output - shifted) * 60 / span
+
+    def average_rate(self, start=0.0):
+        """Mean target output in items per minute from start seconds to the end of the run"""
+        first = np.searchsorted(self.times, start)
+        elapsed = self.times[-1] - self.times[first]
+        if elapsed <= 0:
+            return 0.0
+        return float((self.target_output[-1] - self.target_output[first]) * 60 / elapsed)
+
+    def time_to_full_output(self, threshold=0.99, window=None):
+        """First time (seconds) the trailing output rate reaches threshold * target rate
+
+        With a window shorter than a slow recipe's cycle the trailing rate swings
+        with each burst of output, so the default window spans several of the
+        slowest cycles in the chain.
+        """
+        rate = self.output_rate(window)
+        reached = np.nonzero(rate >= threshold * self.target_rate)[0]
+        return float(self.times[reached[0]]) if len(reached) else None
+
+    def starvation_report(self):
+        """Seconds each node spent with idle machines waiting on inputs"""
+        step = self.times[1] - self.times[0] if len(self.times) > 1 else 0.0
+        return {name: float(self.starved[:, i].sum() * step) for i, name in enumerate(self.node_names)}
+
+
+class FactorySimulation:
+    def __init__(self, optimizer, chain, scale=1.0, dt=None, belt='belt1', pipe='pipe1',
+                 transit_time=5.0):
+        """Build machine, buffer and edge arrays from a solved production chain"""
+        if chain.get('production_tree') is None or chain['production_tree'].get('recipe') is None:
+            raise ValueError(f"No production tree to simulate for {chain.get('target')}")
+
+        self.optimizer = optimizer
+        self.chain = chain
+        self.scale = scale
+        self.transit_time = transit_time
+
+        data = optimizer.data
+        self.stack_sizes = {item['key_name']: item.get('stack_size', DEFAULT_ITEM_STACK)
+                            for item in data.get('items', [])}
+        self.fluid_keys = {fluid['key_name'] for fluid in data.get('fluids', [])}
+        belt_rates = {b['key_name']: b['rate'] for b in data.get('belts', [])}
+        pipe_rates = {p['key_name']: p['rate'] for p in data.get('pipes', [])}
+        self.belt_rate = belt_rates.get(belt, 60)
+        self.pipe_rate = pipe_rates.get(pipe, 300)
+
+        self._collect_graph()
+        self._build_arrays()
+
+        min_cycle = self.m_cycle[~self.m_is_source].min()
+        self.dt = dt if dt is not None else min(1.0, min_cycle / 2)
+        if self.dt > min_cycle:
+            raise ValueError(f"dt={self.dt} exceeds the fastest machine cycle ({min_cycle:.2f}s)")
+
+        self._build_edges()
+
+    def _buffer_size(self, item):
+        """Buffer capacity for one slot holding item"""
+        if item in self.fluid_keys:
+            return DEFAULT_FLUID_BUFFER
+        return self.stack_sizes.get(item, DEFAULT_ITEM_STACK)
+
+    def _collect_graph(self):
+        """Walk the production tree into recipe nodes, raw sources and aggregated flows"""
+        self.node_recipe = {}
+        self.node_buildings = defaultdict(float)
+        self.source_rates = defaultdict(float)
+        self.flows = defaultdict(float)
+
+        def walk(tree_node):
+            name = tree_node['recipe']
+            self.node_recipe[name] = self.optimizer.recipes[tree_node['item']]
+            self.node_buildings[name] += tree_node['buildings'] * self.scale
+            for child in tree_node['children']:
+                rate = child['rate'] * self.scale
+                if child.get('recipe'):
+                    self.flows[(child['recipe'], name, child['item'])] += rate
+                    walk(child)
+                else:
+                    source = f"source:{child['item']}"
+                    self.source_rates[source] += rate
+                    self.flows[(source, name, child['item'])] += rate
+
+        walk(self.chain['production_tree'])
+        self.target_node = self.chain['production_tree']['recipe']
+        self.target_item = self.chain['production_tree']['item']
+        self.node_names = list(self.node_recipe) + list(self.source_rates)
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+
+    def _build_arrays(self):
+        """Lay out machines, input slots and output slots as flat arrays"""
+        m_node, m_cycle, m_source = [], [], []
+        s_machine, s_item_port, s_need, s_cap = [], [], [], []
+        o_machine, o_item_port, o_yield, o_cap, o_rate = [], [], [], [], []
+        self.in_ports, self.out_ports = {}, {}
+
+        def port(ports, node, item):
+            return ports.setdefault((node, item), len(ports))
+
+        for name, recipe in self.node_recipe.items():
+            exact = self.node_buildings[name]
+            count = max(1, math.ceil(exact - 1e-9))
+            clock = exact / count
+            for _ in range(count):
+                machine = len(m_node)
+                m_node.append(self.node_index[name])
+                m_cycle.append(recipe.time / clock)
+                m_source.append(False)
+                for item, amount in recipe.ingredients.items():
+                    s_machine.append(machine)
+                    s_item_port.append(port(self.in_ports, name, item))
+                    s_need.append(amount)
+                    s_cap.append(max(self._buffer_size(item), amount))
+                for item, amount in recipe.products.items():
+                    o_machine.append(machine)
+                    o_item_port.append(port(self.out_ports, name, item))
+                    o_yield.append(amount)
+                    o_cap.append(max(self._buffer_size(item), amount))
+                    o_rate.append(0.0)
+
+        for name, rate in self.source_rates.items():
+            item = name.split(':', 1)[1]
+            machine = len(m_node)
+            m_node.append(self.node_index[name])
+            m_cycle.append(np.inf)
+            m_source.append(True)
+            o_machine.append(machine)
+            o_item_port.append(port(self.out_ports, name, item))
+            o_yield.append(0.0)
+            o_cap.append(self._buffer_size(item))
+            o_rate.append(rate / 60)
+
+        self.m_node = np.array(m_node, dtype=np.intp)
+        self.m_cycle = np.array(m_cycle, dtype=float)
+        self.m_is_source = np.array(m_source, dtype=bool)
+        self.s_machine = np.array(s_machine, dtype=np.intp)
+        self.s_port = np.array(s_item_port, dtype=np.intp)
+        self.s_need = np.array(s_need, dtype=float)
+        self.s_cap = np.array(s_cap, dtype=float)
+        self.o_machine = np.array(o_machine, dtype=np.intp)
+        self.o_port = np.array(o_item_port, dtype=np.intp)
+        self.o_yield = np.array(o_yield, dtype=float)
+        self.o_cap = np.array(o_cap, dtype=float)
+        self.o_rate = np.array(o_rate, dtype=float)
+
+    def _build_edges(self):
+        """Create belt/pipe edges with capacities and transit delays in steps"""
+        e_src, e_dst, e_cap, e_flow = [], [], [], []
+        for (src, dst, item), rate in self.flows.items():
+            lane_rate = self.pipe_rate if item in self.fluid_keys else self.belt_rate
+            lanes = max(1, math.ceil(rate / lane_rate - 1e-9))
+            e_src.append(self.out_ports[(src, item)])
+            e_dst.append(self.in_ports[(dst, item)])
+            e_cap.append(lanes * lane_rate / 60)
+            e_flow.append(rate)
+
+        self.e_src = np.array(e_src, dtype=np.intp)
+        self.e_dst = np.array(e_dst, dtype=np.intp)
+        self.e_cap = np.array(e_cap, dtype=float)
+        flow = np.array(e_flow, dtype=float)
+
+        # Split producer output and consumer room between edges by planned flow
+        n_out, n_in = len(self.out_ports), len(self.in_ports)
+        self.e_share = flow / np.bincount(self.e_src, flow, minlength=n_out)[self.e_src]
+        self.e_room_share = flow / np.bincount(self.e_dst, flow, minlength=n_in)[self.e_dst]
+        # Each pass of overflow to siblings settles at least one more full edge per producer
+        self.max_fan_out = int(np.bincount(self.e_src, minlength=n_out).max(initial=1))
+
+        self.e_delay = max(1, int(round(self.transit_time / self.dt)))
+
+        # Items a group can have queued: one splitter stack plus whatever its belts hold
+        belt_hold = np.bincount(self.e_dst, self.e_cap * self.e_delay * self.dt, minlength=n_in)
+        self.in_port_cap = np.array([self._buffer_size(item) for (_, item) in self.in_ports]) + belt_hold
+        self.o_sink = ~np.isin(np.arange(n_out), self.e_src)
+        self.target_port = self.out_ports[(self.target_node, self.target_item)]
+
+    def run(self, duration, record_every=1.0):
+        """Step every machine and edge for duration seconds of game time"""
+        dt = self.dt
+        steps = int(math.ceil(duration / dt))
+        record_stride = max(1, int(round(record_every / dt)))
+        n_machines, n_nodes = len(self.m_node), len(self.node_names)
+        n_in, n_out, n_edges = len(self.in_ports), len(self.out_ports), len(self.e_src)
+
+        in_buf = np.zeros_like(self.s_need)
+        out_buf = np.zeros_like(self.o_yield)
+        manifold = np.zeros(n_in)
+        progress = np.zeros(n_machines)
+        crafting = np.zeros(n_machines, dtype=bool)
+        ring = np.zeros((self.e_delay, n_edges))
+        in_transit = np.zeros(n_edges)
+        backlog = np.zeros(n_edges)
+        sunk = np.zeros(n_out)
+
+        crafters = ~self.m_is_source
+        node_machines = np.bincount(self.m_node, crafters, minlength=n_nodes)
+        node_machines[node_machines == 0] = 1
+        source_slots = self.o_rate > 0
+        s_out_sink = self.o_sink[self.o_port]
+
+        n_records = steps // record_stride + 1
+        times = np.zeros(n_records)
+        target_output = np.zeros(n_records)
+        rec_crafting = np.zeros((n_records, n_nodes))
+        rec_starved = np.zeros((n_records, n_nodes))
+        rec_blocked = np.zeros((n_records, n_nodes))
+
+        for step in range(1, steps + 1):
+            # Raw sources extract at their planned rate
+            out_buf[source_slots] = np.minimum(self.o_cap[source_slots],
+                                               out_buf[source_slots] + self.o_rate[source_slots] * dt)
+
+            # Advance crafting and finish cycles whose outputs fit
+            progress[crafting] += dt / self.m_cycle[crafting]
+            done = crafting & (progress >= 1)
+            overflow = (out_buf + self.o_yield > self.o_cap) & done[self.o_machine]
+            blocked = done & (np.bincount(self.o_machine, overflow, minlength=n_machines) > 0)
+            finish = done & ~blocked
+            out_buf += self.o_yield * finish[self.o_machine]
+            progress[finish] -= 1
+            # A blocked machine waits with its cycle complete rather than banking more progress
+            progress[blocked] = 1
+            crafting[finish] = False
+
+            # Start idle machines whose inputs are stocked
+            short = in_buf < self.s_need
+            idle = crafters & ~crafting
+            ready = idle & (np.bincount(self.s_machine, short, minlength=n_machines) == 0)
+            in_buf -= self.s_need * ready[self.s_machine]
+            crafting |= ready
+            starved = idle & ~ready
+            progress[starved] = 0
+
+            # Unconnected outputs (target and byproducts) go to the sink
+            sunk += np.bincount(self.o_port, out_buf * s_out_sink, minlength=n_out)
+            out_buf[s_out_sink] = 0
+
+            # Belts deliver items that finished their transit
+            slot = step % self.e_delay
+            arrivals = ring[slot].copy()
+            ring[slot] = 0
+            in_transit -= arrivals
+            manifold += np.bincount(self.e_dst, arrivals, minlength=n_in)
+
+            # Belts pick up from producers, limited by capacity and downstream room
+            avail = np.bincount(self.o_port, out_buf, minlength=n_out)
+            room = self.in_port_cap - manifold - np.bincount(self.e_dst, in_transit, minlength=n_in)
+            room_limit = np.clip(room[self.e_dst] * self.e_room_share, 0, None)
+
+            # New output is owed to each belt by planned share; a belt that is only slow keeps its
+            # claim, while a full consumer's claim passes to siblings that can still take items
+            backlog += self.e_share * (avail - np.bincount(self.e_src, backlog, minlength=n_out))[self.e_src]
+            for _ in range(self.max_fan_out):
+                full = backlog > room_limit + 1e-9
+                excess = np.where(full, backlog - room_limit, 0)
+                open_share = self.e_share * ~full
+                port_open = np.bincount(self.e_src, open_share, minlength=n_out)
+                moved = np.divide(np.bincount(self.e_src, excess, minlength=n_out), port_open,
+                                  out=np.zeros(n_out), where=port_open > 0)
+                backlog -= excess * (port_open > 0)[self.e_src]
+                backlog += open_share * moved[self.e_src]
+            send = np.minimum(backlog, np.minimum(self.e_cap * dt, room_limit))
+            backlog -= send
+            taken = np.bincount(self.e_src, send, minlength=n_out)
+            frac = np.divide(taken, avail, out=np.zeros(n_out), where=avail > 0)
+            out_buf *= 1 - frac[self.o_port]
+            ring[slot] += send
+            in_transit += send
+
+            # Splitters fill machine input buffers in proportion to free space
+            slot_room = self.s_cap - in_buf
+            port_room = np.bincount(self.s_port, slot_room, minlength=n_in)
+            give = np.minimum(manifold, port_room)
+            fill = np.divide(give, port_room, out=np.zeros(n_in), where=port_room > 0)
+            in_buf += slot_room * fill[self.s_port]
+            manifold -= give
+
+            if step % record_stride == 0:
+                row = step // record_stride
+                times[row] = step * dt
+                target_output[row] = sunk[self.target_port]
+                rec_crafting[row] = np.bincount(self.m_node, crafting & ~blocked, minlength=n_nodes) / node_machines
+                rec_starved[row] = np.bincount(self.m_node, starved, minlength=n_nodes) / node_machines
+                rec_blocked[row] = np.bincount(self.m_node, blocked, minlength=n_nodes) / node_machines
+
+        sunk_items = {item: float(sunk[index]) for (node, item), index in self.out_ports.items()
+                      if self.o_sink[index] and sunk[index] > 0}
+
+        return SimulationResult(
+            times=times,
+            target_output=target_output,
+            target_rate=self.chain['target_rate'] * self.scale,
+            node_names=self.node_names,
+            crafting=rec_crafting,
+            starved=rec_starved,
+            blocked=rec_blocked,
+            sunk=sunk_items,
+            slowest_cycle=float(self.m_cycle[crafters].max())
+        )
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+import os
+from collections import Counter
+
+import pytest
+
+from exporter import CSV_COLUMNS, export_chain, iter_records, iter_tree, write_csv, write_dot
+from main import SatisfactoryOptimizer
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'data.json')
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return SatisfactoryOptimizer(DATA_PATH)
+
+
+@pytest.fixture(scope='module')
+def chain(optimizer):
+    return optimizer.calculate_production_chain('computer')
+
+
+def test_record_counts_match_tree(optimizer, chain):
+    kinds = Counter(record['record'] for record in iter_records(chain, optimizer))
+    nodes = len(list(iter_tree(chain['production_tree'])))
+
+    assert kinds['summary'] == 1
+    assert kinds['node'] == nodes
+    assert kinds['edge'] == nodes - 1
+    assert kinds['recipe'] == len(chain['recipes_used'])
+    assert kinds['building'] == len(chain['buildings_needed'])
+    assert kinds['raw_material'] == len(chain['raw_materials'])
+    assert kinds.get('warning', 0) == len(chain['warnings'])
+
+
+def test_csv_round_trip(optimizer, chain):
+    f = io.StringIO(newline='')
+    write_csv(iter_records(chain, optimizer), f)
+    f.seek(0)
+    reader = csv.DictReader(f)
+    rows = list(reader)
+    records = list(iter_records(chain, optimizer))
+
+    assert reader.fieldnames == CSV_COLUMNS
+    assert len(rows) == len(records)
+    for row, record in zip(rows, records):
+        assert row == {column: '' if record.get(column) is None else str(record[column])
+                       for column in CSV_COLUMNS}
+
+
+def test_dot_has_one_edge_per_child(optimizer, chain):
+    f = io.StringIO()
+    write_dot(chain, optimizer, f)
+    nodes = len(list(iter_tree(chain['production_tree'])))
+
+    assert sum(' -> ' in line for line in f.getvalue().splitlines()) == nodes - 1
+
+
+def test_export_chain_picks_format_from_extension(optimizer, chain, tmp_path):
+    path = export_chain(chain, optimizer, str(tmp_path / 'computer.JSONL'))
+    with open(path, encoding='utf-8') as f:
+        first = json.loads(f.readline())
+    assert first['record'] == 'summary' and first['item'] == 'computer'
+
+    with pytest.raises(ValueError):
+        export_chain(chain, optimizer, str(tmp_path / 'computer.txt'))
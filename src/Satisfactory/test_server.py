@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from server import PlanningServer
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'data.json')
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+
+def run_with_server(scenario):
+    async def runner():
+        server = PlanningServer(DATA_PATH, port=0, workers=1)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(runner())
+
+
+def test_routes():
+    async def scenario(server):
+        status, health = await request(server.port, 'GET', '/health')
+        assert status == 200 and health['status'] == 'ok'
+
+        status, items = await request(server.port, 'GET', '/items')
+        assert status == 200 and items['computer'] == 'Computer'
+
+        status, chain = await request(server.port, 'GET', '/chain?item=iron-plate')
+        assert status == 200 and chain['target_rate'] == 20.0
+
+        body = {'item': 'Iron Plate', 'resources': [{'resource_type': 'iron-ore', 'purity': 'pure', 'miner_mk': 2}]}
+        status, chain = await request(server.port, 'POST', '/chain', body)
+        assert status == 200
+        assert chain['resource_nodes_needed']['iron-ore']['available_rate'] == 240.0
+
+        status, _ = await request(server.port, 'GET', '/missing')
+        assert status == 404
+
+    run_with_server(scenario)
+
+
+@pytest.mark.parametrize('method, path, body', [
+    ('GET', '/chain', None),
+    ('GET', '/chain?item=iron-plate&resources=x', None),
+    ('POST', '/chain', [1, 2]),
+    ('POST', '/chain', b'not json'),
+    ('POST', '/chain', {'item': 'iron-plate', 'resources': [{'resource_type': ['iron-ore']}]}),
+    ('POST', '/chain', {'item': 'iron-plate', 'resources': [{'resource_type': 'iron-ore', 'purity': 1},
+                                                            {'resource_type': 'iron-ore', 'purity': 'pure'}]}),
+    ('POST', '/chain', {'item': ['iron-plate']}),
+])
+def test_bad_chain_requests(method, path, body):
+    async def scenario(server):
+        status, payload = await request(server.port, method, path, body)
+        assert status == 400
+        assert 'error' in payload
+
+    run_with_server(scenario)
+
+
+def test_concurrent_identical_queries_coalesce():
+    async def scenario(server):
+        # Occupy the only worker so every request arrives while the first solve is pending
+        loop = asyncio.get_running_loop()
+        busy = loop.run_in_executor(server.executor, time.sleep, 0.5)
+        responses = await asyncio.gather(*[request(server.port, 'GET', '/chain?item=computer')
+                                           for _ in range(50)])
+        await busy
+
+        assert all(status == 200 for status, _ in responses)
+        assert server.stats['solves'] == 1
+        assert server.stats['coalesced'] == 49
+
+    run_with_server(scenario)
+
+
+def test_missing_data_file():
+    with pytest.raises(FileNotFoundError):
+        PlanningServer('no-such-data.json')
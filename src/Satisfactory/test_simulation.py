@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from main import SatisfactoryOptimizer
+from simulation import FactorySimulation
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'data.json')
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return SatisfactoryOptimizer(DATA_PATH)
+
+
+def test_iron_plate_reaches_target_rate(optimizer):
+    chain = optimizer.calculate_production_chain('iron-plate')
+    result = FactorySimulation(optimizer, chain).run(600)
+
+    assert result.output_rate()[-1] == pytest.approx(chain['target_rate'])
+    assert result.time_to_full_output() is not None
+    assert result.blocked.sum() == 0
+
+
+def test_refinery_byproduct_is_sunk(optimizer):
+    chain = optimizer.calculate_production_chain('plastic')
+    result = FactorySimulation(optimizer, chain).run(1200)
+
+    assert result.sunk['heavy-oil-residue'] > 0
+    assert result.output_rate()[-1] == pytest.approx(chain['target_rate'])
+
+
+def test_run_shorter_than_window(optimizer):
+    chain = optimizer.calculate_production_chain('computer')
+    result = FactorySimulation(optimizer, chain).run(30)
+
+    assert len(result.output_rate(window=60)) == len(result.times)
+    assert result.time_to_full_output() is None
+
+
+@pytest.mark.parametrize('item', ['heavy-modular-frame', 'modular-frame'])
+def test_shared_producer_reaches_target_rate(optimizer, item):
+    # Screws and plates feed several consumers in these chains
+    chain = optimizer.calculate_production_chain(item)
+    result = FactorySimulation(optimizer, chain).run(3600)
+
+    assert result.average_rate(start=1800) == pytest.approx(chain['target_rate'], rel=0.005)
+
+
+def test_default_window_covers_slow_cycles(optimizer):
+    chain = optimizer.calculate_production_chain('adaptive-control-unit')
+    result = FactorySimulation(optimizer, chain).run(3600)
+
+    assert result.default_window() >= 4 * result.slowest_cycle > 60
+    reached = result.time_to_full_output()
+    assert reached is not None
+    # Once reached, the trailing rate no longer drops back to nothing between slow batches
+    assert result.output_rate()[result.times >= reached].min() > 0.5 * chain['target_rate']